@@ -1,8 +1,12 @@
 import os
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from queue import SimpleQueue
 
 def setup_logging(name: str):
+    # idempotent: a second call must not attach duplicate handlers
+    if logging.getLogger().handlers:
+        return
     base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
     log_dir = os.path.join(base_dir, "logs")
     os.makedirs(log_dir, exist_ok=True)
@@ -21,17 +25,35 @@ def setup_logging(name: str):
         "%(asctime)s [%(levelname)s] %(message)s", "%Y-%m-%d %H:%M:%S"
     ))
 
-    logging.basicConfig(level=logging.INFO, handlers=[file_handler, console_handler])
+    # Hand records off to one listener thread so the emitting thread
+    # never pays the formatting or the write syscall.
+    log_queue = SimpleQueue()
+    QueueListener(log_queue, file_handler, console_handler).start()
+    logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(log_queue)])
 
 
 import argparse
 import json
 import logging
+import selectors
 import socket
 import threading
 import tkinter as tk
 from tkinter import ttk, scrolledtext
+from collections import deque
 from datetime import datetime, timezone
+from itertools import islice
+
+# orjson is much faster than the stdlib on the per-batch parse path;
+# fall back to json so the server still runs without it.
+try:
+    import orjson
+
+    _loads = orjson.loads
+    _JSONDecodeError = orjson.JSONDecodeError
+except ImportError:
+    _loads = json.loads
+    _JSONDecodeError = json.JSONDecodeError
 
 def parse_args():
     parser = argparse.ArgumentParser(
@@ -44,15 +66,30 @@ def parse_args():
     return parser.parse_args()
 
 
+class _DroneConn:
+    """Per-connection receive state for the selector loop."""
+    def __init__(self, sock, addr):
+        self.sock = sock
+        self.addr = addr
+        self.buf = bytearray(65536)
+        self.end = 0
+
+
 class CentralServer:
     def __init__(self, host, port):
         self.host = host
         self.port = port
-        self.data_records = []
-        self.anomalies = []
-        self.lock = threading.Lock()
+        # Bounded so a long-running server cannot grow without limit
+        self.data_records = deque(maxlen=10000)
+        self.anomalies = deque(maxlen=1000)
+        # Immutable snapshot of display state, published by the selector
+        # thread and read lock-free by the GUI:
+        # (record rows, anomaly tail)
+        self._snapshot = ((), ())
 
     def start(self):
+        # One selector thread multiplexes every drone connection; the
+        # main thread stays free for the GUI.
         threading.Thread(target=self._start_server, daemon=True).start()
 
     def _start_server(self):
@@ -60,49 +97,107 @@ class CentralServer:
         srv.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         srv.bind((self.host, self.port))
         srv.listen()
+        srv.setblocking(False)
+        sel = selectors.DefaultSelector()
+        sel.register(srv, selectors.EVENT_READ, None)
         logging.info(f"Central Server listening on {self.host}:{self.port}")
         while True:
-            conn, addr = srv.accept()
-            logging.info(f"Drone connected: {addr}")
-            threading.Thread(
-                target=self._handle_drone, args=(conn,), daemon=True
-            ).start()
-
-    def _handle_drone(self, conn):
-        with conn:
-            buf = b""
-            while True:
-                data = conn.recv(4096)
-                if not data:
-                    break
-                buf += data
-                while b"\n" in buf:
-                    line, buf = buf.split(b"\n", 1)
+            for key, _ in sel.select():
+                if key.data is None:
+                    # non-blocking accept can race a peer that already
+                    # aborted the connection
+                    try:
+                        conn, addr = srv.accept()
+                    except OSError:
+                        continue
+                    conn.setblocking(False)
+                    conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                    sel.register(
+                        conn, selectors.EVENT_READ, _DroneConn(conn, addr)
+                    )
+                    logging.info(f"Drone connected: {addr}")
+                else:
+                    # one misbehaving drone must not take down the
+                    # shared selector loop: drop only that connection
                     try:
-                        message = json.loads(line.decode("utf-8"))
-                        self._process_message(message)
-                    except json.JSONDecodeError:
-                        logging.warning("Invalid JSON from Drone")
-        logging.info("Drone disconnected")
+                        self._on_readable(sel, key.data)
+                    except Exception as e:
+                        logging.error(
+                            f"Error on drone {key.data.addr}: {e}"
+                        )
+                        try:
+                            sel.unregister(key.data.sock)
+                        except (KeyError, ValueError):
+                            pass
+                        key.data.sock.close()
+
+    def _on_readable(self, sel, state):
+        # Receive into the connection's preallocated buffer and scan for
+        # newlines in place; only the partial tail is ever moved.
+        try:
+            if state.end == len(state.buf):
+                # a single line outgrew the buffer
+                grown = bytearray(len(state.buf) * 2)
+                grown[:state.end] = state.buf
+                state.buf = grown
+            n = state.sock.recv_into(memoryview(state.buf)[state.end:])
+        except BlockingIOError:
+            return
+        except OSError:
+            n = 0
+        if n == 0:
+            sel.unregister(state.sock)
+            state.sock.close()
+            logging.info("Drone disconnected")
+            return
+        state.end += n
+        buf = state.buf
+        start = 0
+        while True:
+            nl = buf.find(b"\n", start, state.end)
+            if nl < 0:
+                break
+            line = buf[start:nl]
+            start = nl + 1
+            try:
+                message = _loads(line)
+                self._process_message(message)
+            except _JSONDecodeError:
+                logging.warning("Invalid JSON from Drone")
+        if start:
+            # move the partial tail to the front
+            buf[:state.end - start] = buf[start:state.end]
+            state.end -= start
 
     def _process_message(self, message):
         batch = message.get("batch", [])
-        with self.lock:
-            for item in batch:
-                if item.get("type") == "anomaly":
-                    self.anomalies.append(item)
-                    logging.warning(f"Anomaly received: {item}")
-                else:
-                    record = {
-                        "timestamp": item.get(
-                            "last_update",
-                            datetime.now(timezone.utc).isoformat()
-                        ),
-                        "avg_temp": item.get("avg_temp"),
-                        "avg_humid": item.get("avg_humid")
-                    }
-                    self.data_records.append(record)
-                    logging.info(f"Summary received: {record}")
+        for item in batch:
+            if item.get("type") == "anomaly":
+                self.anomalies.append(item)
+                logging.warning(f"Anomaly received: {item}")
+            else:
+                record = {
+                    "timestamp": item.get(
+                        "last_update",
+                        datetime.now(timezone.utc).isoformat()
+                    ),
+                    "avg_temp": item.get("avg_temp"),
+                    "avg_humid": item.get("avg_humid")
+                }
+                self.data_records.append(record)
+                logging.info(f"Summary received: {record}")
+        self._publish_snapshot()
+
+    def _publish_snapshot(self):
+        records = self.data_records
+        rows = tuple(
+            (r["timestamp"], r["avg_temp"], r["avg_humid"])
+            for r in islice(records, max(0, len(records) - 50), None)
+        )
+        tail = tuple(
+            islice(self.anomalies, max(0, len(self.anomalies) - 10), None)
+        )
+        self._snapshot = (rows, tail)
 
 class CentralGUI:
     def __init__(self, server: CentralServer):
@@ -121,6 +216,8 @@ class CentralGUI:
             self.tree.heading(c, text=c.replace("_", " ").title())
             self.tree.column(c, width=120, anchor="center")
         self.tree.pack(side="left", fill="both", expand=True)
+        self._row_ids = []
+        self._last_rows = ()
         sb = ttk.Scrollbar(frame, orient="vertical", command=self.tree.yview)
         self.tree.configure(yscroll=sb.set)
         sb.pack(side="right", fill="y")
@@ -135,36 +232,62 @@ class CentralGUI:
         self._hook_logging()
 
     def _hook_logging(self):
+        # emit only queues the formatted record (deque.append is
+        # thread-safe); the Tk timer drains the queue with one insert
+        # per batch, so handler threads never make Tcl calls.
         class TextHandler(logging.Handler):
-            def __init__(self, widget):
+            def __init__(self):
                 super().__init__()
-                self.widget = widget
+                self.queue = deque()
             def emit(self, record):
-                msg = self.format(record) + "\n"
-                self.widget.insert(tk.END, msg)
-                self.widget.see(tk.END)
-        h = TextHandler(self.log_box)
+                self.queue.append(self.format(record) + "\n")
+        h = TextHandler()
         h.setFormatter(logging.Formatter(
             "%(asctime)s [%(levelname)s] %(message)s"
         ))
         logging.getLogger().addHandler(h)
+        self._log_handler = h
+        self._drain_logs()
+
+    def _drain_logs(self):
+        q = self._log_handler.queue
+        if q:
+            msgs = []
+            while q:
+                msgs.append(q.popleft())
+            self.log_box.insert(tk.END, "".join(msgs))
+            self.log_box.see(tk.END)
+        self.root.after(200, self._drain_logs)
 
     def _schedule_update(self):
-        with self.server.lock:
-            # Refresh table
-            for i in self.tree.get_children():
-                self.tree.delete(i)
-            for rec in self.server.data_records[-50:]:
-                self.tree.insert(
-                    "", "end",
-                    values=(rec["timestamp"], rec["avg_temp"], rec["avg_humid"])
-                )
-            # Refresh anomalies
-            self.ano_box.delete("1.0", tk.END)
-            for a in self.server.anomalies[-10:]:
-                self.ano_box.insert(tk.END, f"{a}\n")
+        # Single atomic read of the published snapshot; the GUI never
+        # holds the server lock during a redraw.
+        rows, anomalies = self.server._snapshot
+        # Refresh table
+        self._update_tree(rows)
+        # Refresh anomalies
+        self.ano_box.delete("1.0", tk.END)
+        for a in anomalies:
+            self.ano_box.insert(tk.END, f"{a}\n")
         self.root.after(1000, self._schedule_update)
 
+    def _update_tree(self, rows):
+        # Update changed rows in place instead of delete + reinsert;
+        # each Treeview call is a Tcl round-trip, so only the diff pays.
+        if rows == self._last_rows:
+            return
+        last = self._last_rows
+        common = min(len(rows), len(self._row_ids))
+        for i in range(common):
+            if i < len(last) and last[i] == rows[i]:
+                continue
+            self.tree.item(self._row_ids[i], values=rows[i])
+        for i in range(common, len(rows)):
+            self._row_ids.append(self.tree.insert("", "end", values=rows[i]))
+        while len(self._row_ids) > len(rows):
+            self.tree.delete(self._row_ids.pop())
+        self._last_rows = rows
+
     def run(self):
         self.root.mainloop()
 
@@ -1,8 +1,12 @@
 import os
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from queue import SimpleQueue
 
 def setup_logging(name: str):
+    # idempotent: a second call must not attach duplicate handlers
+    if logging.getLogger().handlers:
+        return
     base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
     log_dir = os.path.join(base_dir, "logs")
     os.makedirs(log_dir, exist_ok=True)
@@ -21,21 +25,72 @@ def setup_logging(name: str):
         "%(asctime)s [%(levelname)s] %(message)s", "%Y-%m-%d %H:%M:%S"
     ))
 
-    logging.basicConfig(level=logging.INFO, handlers=[file_handler, console_handler])
+    # Hand records off to one listener thread so the emitting thread
+    # never pays the formatting or the write syscall.
+    log_queue = SimpleQueue()
+    QueueListener(log_queue, file_handler, console_handler).start()
+    logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(log_queue)])
 
 
 import argparse
+import asyncio
 import json
 import logging
 import socket
+import struct
 import threading
 import time
 from collections import deque
-from datetime import datetime, timezone
-from queue import Queue
+from itertools import islice
 import tkinter as tk
 from tkinter import ttk, scrolledtext
 
+# Timestamps are only second-granular, so the formatted string is cached
+# and only rebuilt when the clock ticks over.
+_last_sec = 0
+_last_iso = ""
+
+
+def now_iso():
+    global _last_sec, _last_iso
+    s = int(time.time())
+    if s != _last_sec:
+        _last_sec = s
+        _last_iso = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(s))
+    return _last_iso
+
+# numpy stores the rolling window as packed float32 arrays and averages
+# in C; without it the running-sum fallback below is used.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# orjson is much faster than the stdlib on the per-message parse/encode
+# paths; fall back to json so the drone still runs without it.
+try:
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj)
+
+    _loads = orjson.loads
+    _JSONDecodeError = orjson.JSONDecodeError
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj).encode("utf-8")
+
+    _loads = json.loads
+    _JSONDecodeError = json.JSONDecodeError
+
+_log = logging.getLogger()
+
+# Binary sensor frame (must match sensor.py): float32 temp, float32
+# humid, float64 epoch timestamp, 16-byte sensor id, preceded by a
+# 2-byte length header.
+BIN_READING = struct.Struct("<ffd16s")
+BIN_HEADER = struct.Struct("<H")
+
 def parse_args():
     parser = argparse.ArgumentParser(
         description="Drone edge server for sensor data processing and forwarding")
@@ -64,113 +119,242 @@ class DroneEdge:
         self.forward_interval = forward_interval
         self.rolling_window = rolling_window
 
-        self.sensor_data = Queue()
         self.readings = deque(maxlen=rolling_window)
-        self.anomalies = []
+        if np is not None:
+            # structure-of-arrays window: circular write, vectorized mean
+            self._temps = np.zeros(rolling_window, dtype=np.float32)
+            self._hums = np.zeros(rolling_window, dtype=np.float32)
+            self._idx = 0
+        self._temp_sum = 0.0
+        self._humid_sum = 0.0
+        self.anomalies = deque(maxlen=1000)
         self.battery = 100.0
         self.returning = False
         self.forward_queue = []
-        self.lock = threading.Lock()
+        self._central_writer = None
+        self.loop = None
+        # Immutable snapshot of display state, published by the loop
+        # thread and read lock-free by the GUI:
+        # (battery, returning, avg_temp, avg_humid, rows, anomaly tail)
+        self._snapshot = (self.battery, False, 0.0, 0.0, (), ())
 
     def start(self):
-        threading.Thread(target=self._start_sensor_server, daemon=True).start()
-        threading.Thread(target=self._process_loop, daemon=True).start()
-        threading.Thread(target=self._battery_simulation, daemon=True).start()
-        threading.Thread(target=self._forward_loop, daemon=True).start()
-
-    def _start_sensor_server(self):
-        srv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        srv.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        srv.bind(("", self.port))
-        srv.listen()
+        # All drone I/O runs as coroutines on one asyncio loop in a
+        # dedicated thread; the main thread stays free for the GUI.
+        threading.Thread(target=self._run_loop, daemon=True).start()
+
+    def _run_loop(self):
+        asyncio.run(self._main())
+
+    async def _main(self):
+        self.loop = asyncio.get_running_loop()
+        asyncio.create_task(self._battery_simulation())
+        asyncio.create_task(self._forward_loop())
+        srv_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        srv_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        # Lets additional drone processes bind the same port; the kernel
+        # then load-balances new sensor connections across them.
+        if hasattr(socket, "SO_REUSEPORT"):
+            srv_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        srv_sock.bind(("", self.port))
+        server = await asyncio.start_server(self._handle_sensor, sock=srv_sock)
         logging.info(f"Drone listening for sensors on port {self.port}")
-        while True:
-            conn, addr = srv.accept()
-            logging.info(f"Sensor connected: {addr}")
-            threading.Thread(
-                target=self._handle_sensor,
-                args=(conn,),
-                daemon=True
-            ).start()
-
-    def _handle_sensor(self, conn):
-        with conn:
-            buf = b""
-            while True:
-                data = conn.recv(1024)
-                if not data:
-                    break
-                buf += data
-                while b"\n" in buf:
-                    line, buf = buf.split(b"\n", 1)
-                    try:
-                        reading = json.loads(line.decode("utf-8"))
-                        with self.lock:
-                            self.sensor_data.put(reading)
-                            self.readings.append(reading)
-                        logging.info(f"Received: {reading}")
-                    except json.JSONDecodeError:
-                        logging.warning("Invalid JSON from sensor")
+        async with server:
+            await server.serve_forever()
+
+    # Called from the Tk thread; state changes are posted onto the loop
+    # thread so all mutation happens there.
+    def set_battery_threshold(self, value):
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(
+                setattr, self, "battery_threshold", value
+            )
+        else:
+            self.battery_threshold = value
+
+    def reset_battery(self):
+        def _reset():
+            self.battery = 100.0
+            self.returning = False
+            self._publish_snapshot()
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(_reset)
+        else:
+            _reset()
+
+    async def _handle_sensor(self, reader, writer):
+        addr = writer.get_extra_info("peername")
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        logging.info(f"Sensor connected: {addr}")
+        try:
+            # Sniff the wire format from the first byte: JSON lines start
+            # with '{', binary frames with a length header.
+            first = await reader.read(1)
+            if first == b"{":
+                await self._read_json(reader, first)
+            elif first:
+                await self._read_binary(reader, first)
+        except asyncio.IncompleteReadError:
+            pass
+        finally:
+            writer.close()
             logging.info("Sensor disconnected")
 
-    def _process_loop(self):
+    async def _read_json(self, reader, first):
         while True:
+            line = first + await reader.readline()
+            first = b""
+            if not line:
+                break
+            line = line.strip()
+            if not line:
+                continue
             try:
-                reading = self.sensor_data.get(timeout=1)
-            except:
+                reading = _loads(line)
+            except _JSONDecodeError:
+                logging.warning("Invalid JSON from sensor")
                 continue
-            with self.lock:
-                if self.readings:
-                    temps = [r["temperature"] for r in self.readings]
-                    hums = [r["humidity"] for r in self.readings]
-                    avg_temp = sum(temps) / len(temps)
-                    avg_humid = sum(hums) / len(hums)
-                else:
-                    avg_temp = avg_humid = 0.0
-
-                # Anomaly detection
-                if (reading["temperature"] < -10 or reading["temperature"] > 60 or
-                    reading["humidity"] < 0 or reading["humidity"] > 100):
-                    anomaly = {**reading, "type": "anomaly"}
-                    self.anomalies.append(anomaly)
-                    logging.warning(f"Anomaly detected: {anomaly}")
-
-                summary = {
-                    "avg_temp": round(avg_temp, 2),
-                    "avg_humid": round(avg_humid, 2),
-                    "last_update": datetime.now(timezone.utc).isoformat()
-                }
-                if not self.returning:
-                    self.forward_queue.append(summary)
-            time.sleep(0.1)
-
-    def _battery_simulation(self):
+            self._ingest(reading)
+
+    async def _read_binary(self, reader, first):
+        header = first + await reader.readexactly(1)
+        while True:
+            (length,) = BIN_HEADER.unpack(header)
+            payload = await reader.readexactly(length)
+            if length != BIN_READING.size:
+                logging.warning("Bad frame length from sensor")
+            else:
+                temperature, humidity, ts, sid = BIN_READING.unpack(payload)
+                self._ingest({
+                    "sensor_id": sid.rstrip(b"\x00").decode("utf-8"),
+                    # round away float32 transport noise
+                    "temperature": round(temperature, 2),
+                    "humidity": round(humidity, 2),
+                    "timestamp": time.strftime(
+                        "%Y-%m-%dT%H:%M:%SZ", time.gmtime(ts)
+                    )
+                })
+            header = await reader.readexactly(2)
+
+    def _ingest(self, reading):
+        self._append_reading(reading)
+        self._process_reading(reading)
+        # per-reading logging is DEBUG-only; the guard also skips the
+        # call (and the dict repr) when the level is filtered
+        if _log.isEnabledFor(logging.DEBUG):
+            _log.debug("Received: %s", reading)
+
+    def _append_reading(self, reading):
+        if self.readings.maxlen == 0:
+            # zero-size window: nothing is retained and averages stay
+            # 0.0, matching the pre-rolling-sum behaviour
+            return
+        if np is not None:
+            self._temps[self._idx] = reading["temperature"]
+            self._hums[self._idx] = reading["humidity"]
+            self._idx = (self._idx + 1) % len(self._temps)
+        else:
+            # Keep running sums in step with the deque so averages are
+            # O(1) per reading instead of a full walk of the window.
+            if len(self.readings) == self.readings.maxlen:
+                evicted = self.readings[0]
+                self._temp_sum -= evicted["temperature"]
+                self._humid_sum -= evicted["humidity"]
+            self._temp_sum += reading["temperature"]
+            self._humid_sum += reading["humidity"]
+        self.readings.append(reading)
+
+    def averages(self):
+        n = len(self.readings)
+        if n == 0:
+            return 0.0, 0.0
+        if np is not None:
+            # until the window wraps only the first n slots are live
+            return float(self._temps[:n].mean()), float(self._hums[:n].mean())
+        return self._temp_sum / n, self._humid_sum / n
+
+    def _publish_snapshot(self):
+        avg_temp, avg_humid = self.averages()
+        rows = tuple(
+            (r["sensor_id"], r["temperature"], r["humidity"], r["timestamp"])
+            for r in self.readings
+        )
+        tail = tuple(
+            islice(self.anomalies, max(0, len(self.anomalies) - 10), None)
+        )
+        self._snapshot = (
+            self.battery, self.returning, avg_temp, avg_humid, rows, tail
+        )
+
+    def _process_reading(self, reading):
+        avg_temp, avg_humid = self.averages()
+
+        # Anomaly detection
+        if (reading["temperature"] < -10 or reading["temperature"] > 60 or
+            reading["humidity"] < 0 or reading["humidity"] > 100):
+            anomaly = {**reading, "type": "anomaly"}
+            self.anomalies.append(anomaly)
+            logging.warning(f"Anomaly detected: {anomaly}")
+
+        summary = {
+            "avg_temp": round(avg_temp, 2),
+            "avg_humid": round(avg_humid, 2),
+            "last_update": now_iso()
+        }
+        if not self.returning:
+            self.forward_queue.append(summary)
+        self._publish_snapshot()
+
+    async def _battery_simulation(self):
         while True:
-            time.sleep(1)
-            with self.lock:
-                self.battery = max(0.0, self.battery - 0.5)
-                if self.battery <= self.battery_threshold and not self.returning:
-                    self.returning = True
-                    logging.warning("Battery low: returning to base")
-
-    def _forward_loop(self):
+            await asyncio.sleep(1)
+            self.battery = max(0.0, self.battery - 0.5)
+            if self.battery <= self.battery_threshold and not self.returning:
+                self.returning = True
+                logging.warning("Battery low: returning to base")
+            self._publish_snapshot()
+
+    async def _forward_loop(self):
         while True:
-            time.sleep(self.forward_interval)
-            with self.lock:
-                if not self.returning and self.forward_queue:
-                    batch = list(self.forward_queue)
-                    try:
-                        self._send_to_central(batch)
-                        self.forward_queue.clear()
-                    except Exception as e:
-                        logging.error(f"Forward failed: {e}")
-
-    def _send_to_central(self, data_batch):
-        payload = json.dumps({"batch": data_batch}).encode("utf-8") + b"\n"
-        with socket.create_connection(
-            (self.central_ip, self.central_port), timeout=5
-        ) as sock:
-            sock.sendall(payload)
+            await asyncio.sleep(self.forward_interval)
+            if not self.returning and self.forward_queue:
+                # Swap the queue out before awaiting: _ingest keeps
+                # appending to the fresh list while the send is in
+                # flight, so nothing queued mid-send can be lost.
+                batch = self.forward_queue
+                self.forward_queue = []
+                try:
+                    await self._send_to_central(batch)
+                except Exception as e:
+                    # re-prepend so the failed batch goes out first on
+                    # the next attempt
+                    self.forward_queue[:0] = batch
+                    logging.error(f"Forward failed: {e}")
+
+    async def _send_to_central(self, data_batch):
+        payload = _dumps({"batch": data_batch}) + b"\n"
+        # Reuse one long-lived connection instead of paying the TCP
+        # handshake on every forward interval; reconnect on error. Both
+        # awaits are capped at 5 s so a central that stops reading can
+        # never hang the forward loop.
+        if self._central_writer is None:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(self.central_ip, self.central_port),
+                timeout=5
+            )
+            sock = writer.get_extra_info("socket")
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            self._central_writer = writer
+        try:
+            self._central_writer.write(payload)
+            await asyncio.wait_for(self._central_writer.drain(), timeout=5)
+        except (OSError, asyncio.TimeoutError):
+            self._central_writer.close()
+            self._central_writer = None
+            raise
         logging.info(f"Forwarded {len(data_batch)} summaries to Central Server")
 
 class DroneGUI:
@@ -227,6 +411,8 @@ class DroneGUI:
             self.tree.heading(c, text=c.replace("_", " ").title())
             self.tree.column(c, width=100, anchor="center")
         self.tree.pack(side="left", fill="both", expand=True)
+        self._row_ids = []
+        self._last_rows = ()
 
         sc = ttk.Scrollbar(
             table, orient="vertical", command=self.tree.yview
@@ -248,71 +434,81 @@ class DroneGUI:
         self._hook_logging()
 
     def _on_threshold_change(self, val):
-        with self.drone.lock:
-            self.drone.battery_threshold = float(val)
+        self.drone.set_battery_threshold(float(val))
         logging.info(f"Battery threshold set to {val}% via GUI")
 
     def _reset_battery(self):
-        with self.drone.lock:
-            self.drone.battery = 100.0
-            self.drone.returning = False
+        self.drone.reset_battery()
         logging.info("Battery reset to 100% via GUI")
 
     def _hook_logging(self):
+        # emit only queues the formatted record (deque.append is
+        # thread-safe); the Tk timer drains the queue with one insert
+        # per batch, so background threads never make Tcl calls.
         class TextHandler(logging.Handler):
-            def __init__(self, widget):
+            def __init__(self):
                 super().__init__()
-                self.widget = widget
+                self.queue = deque()
             def emit(self, record):
-                msg = self.format(record) + "\n"
-                self.widget.insert(tk.END, msg)
-                self.widget.see(tk.END)
-        h = TextHandler(self.log)
+                self.queue.append(self.format(record) + "\n")
+        h = TextHandler()
         h.setFormatter(logging.Formatter(
             "%(asctime)s [%(levelname)s] %(message)s"
         ))
         logging.getLogger().addHandler(h)
+        self._log_handler = h
+        self._drain_logs()
+
+    def _drain_logs(self):
+        q = self._log_handler.queue
+        if q:
+            msgs = []
+            while q:
+                msgs.append(q.popleft())
+            self.log.insert(tk.END, "".join(msgs))
+            self.log.see(tk.END)
+        self.root.after(200, self._drain_logs)
 
     def _schedule_update(self):
-        with self.drone.lock:
-            # Status
-            self.batt_var.set(
-                f"Battery: {self.drone.battery:.1f}%"
-            )
-            self.stat_var.set(
-                "Status: Returning to base"
-                if self.drone.returning else "Status: Active"
-            )
-            # Aggregates
-            temps = [r["temperature"] for r in self.drone.readings]
-            hums = [r["humidity"] for r in self.drone.readings]
-            if temps:
-                self.avg_temp.set(
-                    f"Avg Temp: {sum(temps)/len(temps):.2f}°C"
-                )
-                self.avg_hum.set(
-                    f"Avg Humid: {sum(hums)/len(hums):.2f}%"
-                )
-            # Table
-            for i in self.tree.get_children():
-                self.tree.delete(i)
-            for r in list(self.drone.readings):
-                self.tree.insert(
-                    "", "end",
-                    values=(
-                        r["sensor_id"],
-                        r["temperature"],
-                        r["humidity"],
-                        r["timestamp"]
-                    )
-                )
-            # Anomalies
-            self.ano.delete("1.0", tk.END)
-            for a in self.drone.anomalies[-10:]:
-                self.ano.insert(tk.END, f"{a}\n")
+        # Single atomic read of the drone's published snapshot; no lock
+        # and no shared mutable state crosses the thread boundary.
+        battery, returning, avg_temp, avg_humid, rows, anomalies = \
+            self.drone._snapshot
+        # Status
+        self.batt_var.set(f"Battery: {battery:.1f}%")
+        self.stat_var.set(
+            "Status: Returning to base" if returning else "Status: Active"
+        )
+        # Aggregates
+        if rows:
+            self.avg_temp.set(f"Avg Temp: {avg_temp:.2f}°C")
+            self.avg_hum.set(f"Avg Humid: {avg_humid:.2f}%")
+        # Table
+        self._update_tree(rows)
+        # Anomalies
+        self.ano.delete("1.0", tk.END)
+        for a in anomalies:
+            self.ano.insert(tk.END, f"{a}\n")
 
         self.root.after(1000, self._schedule_update)
 
+    def _update_tree(self, rows):
+        # Update changed rows in place instead of delete + reinsert;
+        # each Treeview call is a Tcl round-trip, so only the diff pays.
+        if rows == self._last_rows:
+            return
+        last = self._last_rows
+        common = min(len(rows), len(self._row_ids))
+        for i in range(common):
+            if i < len(last) and last[i] == rows[i]:
+                continue
+            self.tree.item(self._row_ids[i], values=rows[i])
+        for i in range(common, len(rows)):
+            self._row_ids.append(self.tree.insert("", "end", values=rows[i]))
+        while len(self._row_ids) > len(rows):
+            self.tree.delete(self._row_ids.pop())
+        self._last_rows = rows
+
     def run(self):
         self.root.mainloop()
 
@@ -1,8 +1,12 @@
 import os
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from queue import SimpleQueue
 
 def setup_logging(name: str):
+    # idempotent: a second call must not attach duplicate handlers
+    if logging.getLogger().handlers:
+        return
     base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
     log_dir = os.path.join(base_dir, "logs")
     os.makedirs(log_dir, exist_ok=True)
@@ -21,18 +25,44 @@ def setup_logging(name: str):
         "%(asctime)s [%(levelname)s] %(message)s", "%Y-%m-%d %H:%M:%S"
     ))
 
-    logging.basicConfig(level=logging.INFO, handlers=[file_handler, console_handler])
+    # Hand records off to one listener thread so the emitting thread
+    # never pays the formatting or the write syscall.
+    log_queue = SimpleQueue()
+    QueueListener(log_queue, file_handler, console_handler).start()
+    logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(log_queue)])
 
 
 import argparse
-import json
 import logging
 import random
 import socket
+import struct
 import sys
 import threading
 import time
-from datetime import datetime, timezone
+
+# Binary frame: float32 temp, float32 humid, float64 epoch timestamp,
+# 16-byte sensor id — one struct.pack per reading, nothing to parse on
+# the drone. Each frame is preceded by a 2-byte length header.
+BIN_READING = struct.Struct("<ffd16s")
+BIN_HEADER = struct.Struct("<H")
+
+# Timestamps are only second-granular, so the formatted string is cached
+# and only rebuilt when the clock ticks over.
+_last_sec = 0
+_last_iso = ""
+
+
+def now_iso():
+    global _last_sec, _last_iso
+    s = int(time.time())
+    if s != _last_sec:
+        _last_sec = s
+        _last_iso = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(s))
+    return _last_iso
+
+
+_log = logging.getLogger()
 
 
 def parse_args():
@@ -43,18 +73,37 @@ def parse_args():
                         help="Port of the Drone server")
     parser.add_argument("--interval", type=float, default=2.0,
                         help="Seconds between data transmissions")
+    parser.add_argument("--json", action="store_true",
+                        help="Send JSON lines instead of binary frames "
+                             "(interop fallback)")
     return parser.parse_args()
 
 
 
 
 class SensorNode:
-    def __init__(self, sensor_id, drone_ip, drone_port, interval):
+    # With TCP_NODELAY every write becomes its own packet, so sub-second
+    # readings are coalesced in an app-level buffer and flushed roughly
+    # once per second (or when the buffer fills), one syscall per flush.
+    FLUSH_SECS = 1.0
+    FLUSH_BYTES = 8192
+
+    def __init__(self, sensor_id, drone_ip, drone_port, interval,
+                 use_json=False):
         self.sensor_id = sensor_id
         self.drone_ip = drone_ip
         self.drone_port = drone_port
         self.interval = interval
+        self.use_json = use_json
         self.socket = None
+        self._sensor_id_bytes = sensor_id.encode("utf-8")[:16]
+        # Only the three numeric/timestamp fields change per reading, so
+        # the constant part of the JSON line is encoded once up front.
+        self._payload_prefix = (
+            b'{"sensor_id":"' + sensor_id.encode("utf-8") + b'","temperature":'
+        )
+        self._send_buf = bytearray()
+        self._last_flush = 0.0
         self.should_run = threading.Event()
         self.should_run.set()
 
@@ -63,6 +112,9 @@ class SensorNode:
             try:
                 logging.info(f"Attempting connection to {self.drone_ip}:{self.drone_port}")
                 self.socket = socket.create_connection((self.drone_ip, self.drone_port), timeout=5)
+                # Readings are tiny and sent one at a time; disable Nagle so
+                # each send goes out immediately instead of waiting to coalesce
+                self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
                 logging.info("Connected to Drone server")
                 return
             except (socket.error, socket.timeout) as e:
@@ -70,18 +122,45 @@ class SensorNode:
                 time.sleep(5)
 
     def send_reading(self):
-        data = {
-            "sensor_id": self.sensor_id,
-            # Simulated readings
-            "temperature": round(random.uniform(15.0, 30.0), 2),
-            "humidity": round(random.uniform(30.0, 70.0), 2),
+        # Simulated readings
+        temperature = round(random.uniform(15.0, 30.0), 2)
+        humidity = round(random.uniform(30.0, 70.0), 2)
+        if self.use_json:
             # UTC timestamp
-            "timestamp": datetime.now(timezone.utc).isoformat()
-        }
-        payload = json.dumps(data).encode('utf-8') + b"\n"
+            timestamp = now_iso()
+            self._send_buf += self._payload_prefix
+            self._send_buf += (
+                f'{temperature},"humidity":{humidity},'
+                f'"timestamp":"{timestamp}"}}\n'
+            ).encode("utf-8")
+        else:
+            timestamp = time.time()
+            self._send_buf += BIN_HEADER.pack(BIN_READING.size)
+            self._send_buf += BIN_READING.pack(
+                temperature, humidity, timestamp, self._sensor_id_bytes
+            )
+        # per-reading logging is DEBUG-only; the guard also skips the
+        # call when the level is filtered
+        if _log.isEnabledFor(logging.DEBUG):
+            _log.debug(
+                "Sent data: temp=%s humid=%s ts=%s",
+                temperature, humidity, timestamp
+            )
+        if (self.interval >= self.FLUSH_SECS
+                or len(self._send_buf) >= self.FLUSH_BYTES
+                or time.monotonic() - self._last_flush >= self.FLUSH_SECS):
+            self.flush()
+
+    def flush(self):
+        if not self._send_buf:
+            return
         try:
-            self.socket.sendall(payload)
-            logging.info(f"Sent data: {data}")
+            with memoryview(self._send_buf) as mv:
+                sent = 0
+                while sent < len(mv):
+                    sent += self.socket.sendmsg([mv[sent:]])
+            self._send_buf.clear()
+            self._last_flush = time.monotonic()
         except socket.error as e:
             logging.error(f"Send failed: {e}")
             self.handle_disconnect()
@@ -114,9 +193,9 @@ if __name__ == "__main__":
     sensor_id = f"sensor_{random.randint(1000, 9999)}"
     setup_logging(sensor_id)
     logging.info("Sensor node started")
-    setup_logging(sensor_id)
 
-    node = SensorNode(sensor_id, args.drone_ip, args.drone_port, args.interval)
+    node = SensorNode(sensor_id, args.drone_ip, args.drone_port, args.interval,
+                      use_json=args.json)
     try:
         node.run()
     except KeyboardInterrupt: